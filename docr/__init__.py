@@ -8,6 +8,18 @@ to Markdown format using OCR.
 __version__ = "0.1.0"
 __author__ = "Erik Craddock"
 
-from .processor import DocumentProcessor, get_supported_extensions, is_supported_file
+from .processor import (
+    DocumentProcessor,
+    convert_documents_to_pdf,
+    get_supported_extensions,
+    is_document_file,
+    is_supported_file,
+)
 
-__all__ = ['DocumentProcessor', 'get_supported_extensions', 'is_supported_file']
\ No newline at end of file
+__all__ = [
+    'DocumentProcessor',
+    'convert_documents_to_pdf',
+    'get_supported_extensions',
+    'is_document_file',
+    'is_supported_file',
+]
\ No newline at end of file
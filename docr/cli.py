@@ -3,15 +3,41 @@ Command-line interface for docr.
 """
 
 import argparse
+import subprocess
 import sys
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .processor import DocumentProcessor, get_supported_extensions, is_supported_file
+from .processor import (
+    DEFAULT_CACHE_DIR,
+    OCR_BACKENDS,
+    DocumentProcessor,
+    convert_documents_to_pdf,
+    get_supported_extensions,
+    is_document_file,
+    is_supported_file,
+)
 from . import __version__
 
 
+# Default number of files processed in parallel
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 4)
+
+
+def _positive_int(value: str) -> int:
+    """Argparse type for integers greater than zero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser."""
     parser = argparse.ArgumentParser(
@@ -36,12 +62,40 @@ def create_parser() -> argparse.ArgumentParser:
         help='Skip OCR for pages that already have text (default: force OCR on all pages)'
     )
     
+    parser.add_argument(
+        '--force-ocr-always',
+        action='store_true',
+        help='Run OCR even on PDFs that already contain text (default: skip OCR for born-digital PDFs)'
+    )
+    
     parser.add_argument(
         '--language', '-l',
         default='eng',
         help='OCR language code (default: eng)'
     )
     
+    parser.add_argument(
+        '--backend',
+        choices=OCR_BACKENDS,
+        default='ocrmypdf',
+        help='OCR engine to use (default: ocrmypdf)'
+    )
+    
+    parser.add_argument(
+        '--clean',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Clean pages with unpaper before OCR (default: off)'
+    )
+    
+    parser.add_argument(
+        '--optimize',
+        type=int,
+        choices=[0, 1, 2, 3],
+        default=0,
+        help='OCRmyPDF output optimization level, 0 disables (default: 0)'
+    )
+    
     parser.add_argument(
         '--recursive', '-r',
         action='store_true',
@@ -54,6 +108,25 @@ def create_parser() -> argparse.ArgumentParser:
         help='Overwrite existing output files'
     )
     
+    parser.add_argument(
+        '--cache-dir',
+        default=str(DEFAULT_CACHE_DIR),
+        help=f'Directory for cached results (default: {DEFAULT_CACHE_DIR})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the result cache'
+    )
+    
+    parser.add_argument(
+        '--workers', '-j',
+        type=_positive_int,
+        default=None,
+        help='Number of files to process in parallel (default: min(CPU count, 4))'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -69,6 +142,22 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _walk_supported_files(root: Path, recursive: bool) -> Iterator[Path]:
+    """Yield supported files under root using os.scandir to avoid extra stat calls."""
+    try:
+        entries = os.scandir(root)
+    except PermissionError as e:
+        print(f"Warning: Skipping unreadable directory: {e.filename}", file=sys.stderr)
+        return
+    
+    with entries:
+        for entry in entries:
+            if recursive and entry.is_dir(follow_symlinks=False):
+                yield from _walk_supported_files(Path(entry.path), recursive)
+            elif entry.is_file() and is_supported_file(entry.name):
+                yield Path(entry.path)
+
+
 def find_input_files(input_path: Path, recursive: bool = False) -> List[Path]:
     """Find all supported input files."""
     files = []
@@ -80,10 +169,7 @@ def find_input_files(input_path: Path, recursive: bool = False) -> List[Path]:
             print(f"Warning: Unsupported file type: {input_path.suffix}", file=sys.stderr)
     
     elif input_path.is_dir():
-        pattern = "**/*" if recursive else "*"
-        for file_path in input_path.glob(pattern):
-            if file_path.is_file() and is_supported_file(str(file_path)):
-                files.append(file_path)
+        files.extend(_walk_supported_files(input_path, recursive))
     
     else:
         raise FileNotFoundError(f"Input path does not exist: {input_path}")
@@ -102,6 +188,26 @@ def determine_output_path(input_file: Path, output_path: Path, is_single_file: b
         return output_path / md_filename
 
 
+# Processor shared by every file handled in the current worker process
+_worker_processor: Optional[DocumentProcessor] = None
+
+
+def _init_worker(processor_options: Dict[str, Any]) -> None:
+    """Create the worker's processor once, when the worker process starts."""
+    global _worker_processor
+    _worker_processor = DocumentProcessor(**processor_options)
+
+
+def _process_one(
+    input_file: str,
+    output_file: str,
+    pdf_path: Optional[str]
+) -> Tuple[bool, Optional[str], float]:
+    """Process a single file in a worker process."""
+    assert _worker_processor is not None
+    return _worker_processor.process_file(input_file, output_file, pdf_path)
+
+
 def main():
     """Main CLI entry point."""
     parser = create_parser()
@@ -120,44 +226,110 @@ def main():
         
         is_single_file = len(input_files) == 1 and input_path.is_file()
         
-        # Create processor
-        processor = DocumentProcessor(
-            force_ocr=not args.no_force_ocr,
-            language=args.language
-        )
+        # Processor settings passed to each worker
+        processor_options = {
+            'force_ocr': not args.no_force_ocr,
+            'language': args.language,
+            'backend': args.backend,
+            'clean': args.clean,
+            'optimize': args.optimize,
+            'force_ocr_always': args.force_ocr_always,
+            'cache_dir': None if args.no_cache else Path(args.cache_dir).expanduser(),
+        }
         
         # Process files
         total_files = len(input_files)
         successful = 0
         failed = 0
         
-        for i, input_file in enumerate(input_files, 1):
-            if args.verbose:
-                print(f"[{i}/{total_files}] Processing: {input_file}")
-            
+        jobs = []
+        claimed_outputs = set()
+        for input_file in input_files:
             # Determine output file path
             output_file = determine_output_path(input_file, output_path, is_single_file)
             
-            # Check if output already exists
-            if output_file.exists() and not args.overwrite:
+            # Check if output already exists, or will be written by an earlier input
+            if output_file in claimed_outputs:
+                if not args.overwrite:
+                    print(f"Skipping {input_file} (output exists, use --overwrite to replace)")
+                    continue
+                print(f"Warning: {input_file} overwrites output of another input: {output_file}", file=sys.stderr)
+                # Only the last input for an output is kept, as when processed in order
+                jobs = [job for job in jobs if job[1] != output_file]
+            elif output_file.exists() and not args.overwrite:
                 print(f"Skipping {input_file} (output exists, use --overwrite to replace)")
                 continue
             
-            # Process the file
-            success, error_msg, processing_time = processor.process_file(
-                str(input_file), 
-                str(output_file)
-            )
-            
-            if success:
-                successful += 1
-                if args.verbose:
-                    print(f"  ✓ Completed in {processing_time:.2f}s -> {output_file}")
-                elif total_files == 1:
-                    print(f"Successfully converted to {output_file}")
-            else:
-                failed += 1
-                print(f"  ✗ Failed: {error_msg}", file=sys.stderr)
+            claimed_outputs.add(output_file)
+            jobs.append((input_file, output_file))
+        
+        if jobs:
+            with tempfile.TemporaryDirectory() as convert_dir:
+                # Convert all uncached office documents up front with a single LibreOffice launch.
+                # Probing the cache hashes each document here and again in its worker; only
+                # office documents are probed, and hashing is cheap next to a soffice launch.
+                cache_probe = DocumentProcessor(**processor_options)
+                to_convert = [
+                    f for f, _ in jobs
+                    if is_document_file(str(f)) and cache_probe.cached_result_path(str(f)) is None
+                ]
+                try:
+                    converted = convert_documents_to_pdf(to_convert, convert_dir)
+                except (OSError, subprocess.CalledProcessError):
+                    # Workers fall back to converting each document individually
+                    converted = {}
+                
+                workers = max(1, min(args.workers if args.workers is not None else DEFAULT_WORKERS, len(jobs)))
+                
+                # Each worker loads its own PaddleOCR model onto the same GPU
+                if args.backend == 'paddle-gpu' and workers > 1:
+                    if args.workers is not None:
+                        print(
+                            "Warning: --backend paddle-gpu runs a single worker to avoid "
+                            "loading one model per worker onto the GPU",
+                            file=sys.stderr
+                        )
+                    workers = 1
+                
+                # Share the CPUs between workers so per-document OCR sharding
+                # does not oversubscribe the machine
+                processor_options['cpu_budget'] = max(1, (os.cpu_count() or 1) // workers)
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(processor_options,)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            _process_one,
+                            str(input_file),
+                            str(output_file),
+                            converted.get(input_file)
+                        ): (input_file, output_file)
+                        for input_file, output_file in jobs
+                    }
+                    
+                    try:
+                        for i, future in enumerate(as_completed(futures), 1):
+                            input_file, output_file = futures[future]
+                            if args.verbose:
+                                print(f"[{i}/{len(jobs)}] Processed: {input_file}")
+                            
+                            success, error_msg, processing_time = future.result()
+                            
+                            if success:
+                                successful += 1
+                                if args.verbose:
+                                    print(f"  ✓ Completed in {processing_time:.2f}s -> {output_file}")
+                                elif total_files == 1:
+                                    print(f"Successfully converted to {output_file}")
+                            else:
+                                failed += 1
+                                print(f"  ✗ Failed: {input_file}: {error_msg}", file=sys.stderr)
+                    except KeyboardInterrupt:
+                        # Drop queued files instead of waiting for them on exit
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
         
         # Print summary for multiple files
         if total_files > 1:
@@ -5,38 +5,372 @@ Converts PDFs, images, and documents to Markdown using OCR.
 
 import subprocess
 import os
+import shutil
+import sys
 import tempfile
 import time
-import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO, Tuple, Optional
 
 import img2pdf
+import numpy as np
+import ocrmypdf
 import pymupdf4llm
 import pymupdf
+from PIL import Image
+
+# BLAKE3 is much faster than SHA-256 for cache keys; fall back when not installed
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    from hashlib import sha256 as _hasher
+
+# Optional in-process Tesseract backend
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+# Supported input extensions, grouped by how they are converted to PDF
+_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp'})
+_DOCUMENT_EXTENSIONS = frozenset({'.txt', '.csv', '.docx', '.doc', '.odt', '.rtf'})
+_SUPPORTED_EXTENSIONS = frozenset({'.pdf'}) | _IMAGE_EXTENSIONS | _DOCUMENT_EXTENSIONS
+
+# Default location for cached Markdown results
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'docr'
+
+# Bump whenever pipeline changes alter the Markdown produced for the same input
+CACHE_FORMAT_VERSION = 2
+
+# RAM-backed tmpfs for intermediate PDFs on Linux. Intermediates live in memory there,
+# so it is only used when it has room for SHM_SPACE_FACTOR times the input size.
+SHM_DIR = '/dev/shm'
+SHM_SPACE_FACTOR = 10
+
+# Read size used when hashing input files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# UTF-8 byte values outside the ASCII range, removed during sanitization
+_NON_ASCII_DELETE = bytes(range(128, 256))
+
+# Born-digital detection: pages sampled and text length that marks a PDF as digital
+BORN_DIGITAL_SAMPLE_PAGES = 5
+BORN_DIGITAL_MIN_CHARS = 200
+
+# Minimum number of pages per OCR chunk when sharding a document
+MIN_PAGES_PER_CHUNK = 4
+
+# Skew detection: pages sampled, raster resolution, search range and deskew threshold
+SKEW_SAMPLE_PAGES = 3
+SKEW_DPI = 72
+SKEW_SEARCH_ANGLES = np.arange(-5.0, 5.25, 0.25)
+SKEW_THRESHOLD_DEGREES = 1.0
+
+# Available OCR backends
+OCR_BACKENDS = ('ocrmypdf', 'tesserocr', 'paddle-gpu')
+
+# Resolution used when rasterizing pages for the tesserocr backend
+TESSEROCR_DPI = 300
+
+# Resolution used when rasterizing pages for the PaddleOCR backend
+PADDLE_DPI = 300
+
+# Tesseract language codes mapped to their PaddleOCR equivalents
+_PADDLE_LANGUAGES = {
+    'eng': 'en',
+    'fra': 'fr',
+    'deu': 'german',
+    'spa': 'es',
+    'por': 'pt',
+    'ita': 'it',
+    'rus': 'ru',
+    'jpn': 'japan',
+    'kor': 'korean',
+    'chi_sim': 'ch',
+    'chi_tra': 'chinese_cht',
+}
+
+# PaddleOCR engines kept alive for the lifetime of the process, keyed by language
+_PADDLE_OCRS: Dict[str, Any] = {}
+
+# Tesseract API instances kept alive for the lifetime of the process, keyed by language
+_TESSEROCR_APIS: Dict[str, Any] = {}
+
+
+def _run_ocrmypdf(input_file: str, output_file: str, options: Dict[str, Any]) -> None:
+    """Run OCRmyPDF in-process (top-level so it can be used from worker processes)."""
+    ocrmypdf.ocr(input_file, output_file, **options)
+
+
+def _get_tesserocr_api(language: str) -> Any:
+    """Return a per-process Tesseract API so trained data is loaded only once."""
+    if tesserocr is None:
+        raise ImportError("The tesserocr backend requires the 'tesserocr' package")
+    
+    api = _TESSEROCR_APIS.get(language)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=language)
+        _TESSEROCR_APIS[language] = api
+    return api
+
+
+def _get_paddle_ocr(language: str) -> Any:
+    """Return a per-process PaddleOCR engine so models are loaded onto the GPU only once."""
+    engine = _PADDLE_OCRS.get(language)
+    if engine is None:
+        # Imported lazily: loading the Paddle framework is slow even when unused
+        try:
+            from paddleocr import PaddleOCR
+        except ImportError as e:
+            raise ImportError("The paddle-gpu backend requires the 'paddleocr' package") from e
+        
+        # PaddleOCR handles a single language; use the first of e.g. 'eng+fra'
+        primary = language.split('+')[0]
+        engine = PaddleOCR(
+            use_angle_cls=True,
+            lang=_PADDLE_LANGUAGES.get(primary, primary),
+            use_gpu=True,
+            show_log=False
+        )
+        _PADDLE_OCRS[language] = engine
+    return engine
+
+
+def convert_documents_to_pdf(input_paths: List[Path], outdir: str) -> Dict[Path, str]:
+    """
+    Convert office documents to PDF with as few LibreOffice launches as possible.
+    
+    Non-document inputs are ignored. Documents sharing a file stem are split into
+    separate batches so their converted PDFs do not overwrite each other.
+    
+    Args:
+        input_paths: Paths to input files
+        outdir: Directory to write converted PDFs into
+        
+    Returns:
+        Mapping of input path to converted PDF path for each converted document
+    """
+    batches: List[Dict[str, Path]] = []
+    for input_path in map(Path, input_paths):
+        if input_path.suffix.lower() not in _DOCUMENT_EXTENSIONS:
+            continue
+        for batch in batches:
+            if input_path.stem not in batch:
+                batch[input_path.stem] = input_path
+                break
+        else:
+            batches.append({input_path.stem: input_path})
+    
+    # A private user profile keeps concurrent calls (e.g. from several workers) from
+    # being handed to an already running LibreOffice instance that produces no output
+    profile_uri = Path(outdir, 'lo-profile').resolve().as_uri()
+    
+    converted = {}
+    for i, batch in enumerate(batches):
+        batch_dir = os.path.join(outdir, str(i))
+        subprocess.run([
+            'libreoffice', f'-env:UserInstallation={profile_uri}',
+            '--headless', '--convert-to', 'pdf',
+            '--outdir', batch_dir, *map(str, batch.values())
+        ], check=True, capture_output=True, text=True)
+        
+        # LibreOffice creates PDF with same name as input
+        for stem, input_path in batch.items():
+            pdf_path = os.path.join(batch_dir, stem + '.pdf')
+            if os.path.exists(pdf_path):
+                converted[input_path] = pdf_path
+    
+    return converted
+
+
+def _hash_file(path: Path) -> str:
+    """Return the hex digest of a file, streamed through a reusable buffer."""
+    h = _hasher()
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    
+    with open(path, 'rb', buffering=0) as f:
+        # Hint the kernel to read ahead aggressively (Linux/POSIX only)
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    
+    return str(h.hexdigest())
+
+
+def _page_ranges(page_count: int, max_chunks: int) -> List[Tuple[int, int]]:
+    """Split pages into up to max_chunks contiguous, near-equal (first, last) ranges."""
+    chunks = max(1, min(max_chunks, page_count // MIN_PAGES_PER_CHUNK))
+    pages_per_chunk, remainder = divmod(page_count, chunks)
+    
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        end = start + pages_per_chunk + (1 if i < remainder else 0) - 1
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+
+def _extract_text_blocks(pdf_path: str, first_page: int, last_page: int) -> List[str]:
+    """Extract block text for a page range (top-level so it can be used from worker processes)."""
+    parts = []
+    with pymupdf.open(pdf_path) as doc:
+        for page_number in range(first_page, last_page + 1):
+            try:
+                blocks = doc[page_number].get_text("blocks", flags=pymupdf.TEXTFLAGS_TEXT)
+                parts.append(f"\n## Page {page_number + 1}\n\n")
+                
+                for block in blocks:
+                    text = block[4].strip()  # Block text content
+                    if text:
+                        parts.append(f"{text}\n\n")
+                        
+            except Exception as page_error:
+                parts.append(f"*[Page {page_number + 1}: Error extracting text: {str(page_error)}]*\n\n")
+    
+    return parts
+
+
+def _estimate_skew(pix: pymupdf.Pixmap) -> float:
+    """Estimate page skew in degrees using a projection-profile search over small shears."""
+    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    ys, xs = np.nonzero(img < 128)
+    if ys.size == 0:
+        return 0.0
+    
+    # Text rows line up into sharp peaks when the shear cancels the skew
+    best_angle, best_score = 0.0, -1.0
+    for angle in SKEW_SEARCH_ANGLES:
+        rows = np.round(ys - xs * np.tan(np.radians(angle))).astype(np.int64)
+        profile = np.bincount(rows - rows.min()).astype(np.float64)
+        score = float(np.dot(profile, profile))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    
+    return best_angle
+
+
+def _temp_dir_parent(input_path: Path) -> Optional[str]:
+    """Pick the parent for a processing temp dir: /dev/shm if usable, else the default."""
+    if sys.platform != 'linux' or not os.path.isdir(SHM_DIR):
+        return None
+    
+    try:
+        stats = os.statvfs(SHM_DIR)
+        needed = input_path.stat().st_size * SHM_SPACE_FACTOR
+    except OSError:
+        return None
+    
+    return SHM_DIR if stats.f_bavail * stats.f_frsize >= needed else None
+
+
+@contextmanager
+def _atomic_write(path: Path) -> Iterator[TextIO]:
+    """
+    Open a text file that replaces path only once the with-block succeeds.
+    
+    A failure never leaves a partial file at path. The temp file lives next to path
+    rather than in a temp dir because os.replace cannot move across filesystems.
+    """
+    fd, partial_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        # mkstemp creates files as 0600; give the output the usual umask-based mode
+        if hasattr(os, 'fchmod'):
+            umask = os.umask(0)
+            os.umask(umask)
+            os.fchmod(fd, 0o666 & ~umask)
+        
+        with open(fd, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(partial_path, path)
+    except BaseException:
+        os.unlink(partial_path)
+        raise
+
+
+def _sanitize_text(text: str) -> str:
+    """Strip non-ASCII characters and collapse whitespace for LLM compatibility."""
+    text = text.encode('utf-8', 'ignore').translate(None, _NON_ASCII_DELETE).decode('ascii')
+    return ' '.join(text.split())
+
+
+def _write_sanitized_pages(pages: Iterable[str], out_fh: TextIO) -> None:
+    """
+    Sanitize and write pages one at a time.
+    
+    Pages are joined with the same single space a whole-document pass would produce.
+    """
+    separator = ''
+    for page_text in pages:
+        text = _sanitize_text(page_text)
+        if text:
+            out_fh.write(separator)
+            out_fh.write(text)
+            separator = ' '
 
 
 class DocumentProcessor:
     """Handles document to markdown conversion with OCR."""
     
-    def __init__(self, force_ocr: bool = True, language: str = 'eng'):
+    def __init__(
+        self,
+        force_ocr: bool = True,
+        language: str = 'eng',
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        force_ocr_always: bool = False,
+        clean: bool = False,
+        optimize: int = 0,
+        backend: str = 'ocrmypdf',
+        cpu_budget: Optional[int] = None
+    ):
         """
         Initialize processor.
         
         Args:
             force_ocr: Whether to force OCR on all pages
             language: OCR language code (default: 'eng')
+            cache_dir: Directory for cached Markdown results, or None to disable caching
+            force_ocr_always: Run OCR even on PDFs that already contain text
+            clean: Clean pages with unpaper before OCR
+            optimize: OCRmyPDF output optimization level (0-3, 0 disables)
+            backend: OCR engine to use, one of OCR_BACKENDS (default: 'ocrmypdf')
+            cpu_budget: CPUs this processor may use for per-document parallelism
+                (default: all CPUs; set lower when several processors run at once)
         """
+        if backend not in OCR_BACKENDS:
+            raise ValueError(f"Unsupported OCR backend: {backend}")
+        
         self.force_ocr = force_ocr
         self.language = language
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.force_ocr_always = force_ocr_always
+        self.clean = clean
+        self.optimize = optimize
+        self.backend = backend
+        self.cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
     
-    def process_file(self, input_path: str, output_path: str) -> Tuple[bool, Optional[str], float]:
+    def process_file(
+        self,
+        input_path: str,
+        output_path: str,
+        pdf_path: Optional[str] = None
+    ) -> Tuple[bool, Optional[str], float]:
         """
         Process a single file and convert to Markdown.
         
         Args:
             input_path: Path to input file
             output_path: Path to save Markdown output
+            pdf_path: Already converted PDF for the input, if available
             
         Returns:
             Tuple of (success, error_message, processing_time)
@@ -44,28 +378,52 @@ class DocumentProcessor:
         start_time = time.time()
         
         try:
-            input_path = Path(input_path).resolve()
-            output_path = Path(output_path).resolve()
+            input_file = Path(input_path).resolve()
+            output_file = Path(output_path).resolve()
             
-            if not input_path.exists():
-                return False, f"Input file does not exist: {input_path}", 0.0
+            if not input_file.exists():
+                return False, f"Input file does not exist: {input_file}", 0.0
             
             # Create output directory if needed
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Reuse a previous result for identical input and settings
+            cache_path = None
+            if self.cache_dir is not None:
+                cache_path = self._cache_path(input_file)
+                if cache_path.exists():
+                    with open(cache_path, encoding='utf-8') as cached, \
+                            _atomic_write(output_file) as f:
+                        shutil.copyfileobj(cached, f)
+                    processing_time = time.time() - start_time
+                    return True, None, processing_time
             
-            with tempfile.TemporaryDirectory() as tmpdir:
+            with tempfile.TemporaryDirectory(dir=_temp_dir_parent(input_file)) as tmpdir:
                 # Convert to PDF if needed
-                pdf_path = self._convert_to_pdf(input_path, tmpdir)
+                if pdf_path is None:
+                    pdf_path = self._convert_to_pdf(input_file, tmpdir)
                 
-                # Apply OCR
-                ocr_pdf_path = self._apply_ocr(pdf_path, tmpdir)
+                # Apply OCR, unless the PDF already has a usable text layer
+                ocr_pdf_path: Optional[str]
+                if not self.force_ocr_always and self._is_born_digital(pdf_path):
+                    ocr_pdf_path = pdf_path
+                elif self.backend == 'paddle-gpu':
+                    # PaddleOCR produces text directly, without an OCR'd PDF
+                    ocr_pdf_path = None
+                else:
+                    ocr_pdf_path = self._apply_ocr(pdf_path, tmpdir)
                 
-                # Convert to Markdown
-                markdown_text = self._convert_to_markdown(ocr_pdf_path)
+                # Convert to Markdown, streaming pages to the output file
+                with _atomic_write(output_file) as f:
+                    if ocr_pdf_path is None:
+                        self._ocr_to_markdown_paddle(pdf_path, f)
+                        converted = True
+                    else:
+                        converted = self._convert_to_markdown(ocr_pdf_path, f)
                 
-                # Save output
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown_text)
+                # Fallback output may come from a transient failure, so never cache it
+                if cache_path is not None and converted:
+                    self._write_cache(cache_path, output_file)
                 
                 processing_time = time.time() - start_time
                 return True, None, processing_time
@@ -74,6 +432,54 @@ class DocumentProcessor:
             processing_time = time.time() - start_time
             return False, str(e), processing_time
     
+    def cached_result_path(self, input_path: str) -> Optional[Path]:
+        """
+        Look up the cached Markdown result for an input file.
+        
+        Args:
+            input_path: Path to input file
+            
+        Returns:
+            Path to the cached Markdown, or None if caching is disabled or there is no entry
+        """
+        if self.cache_dir is None:
+            return None
+        
+        cache_path = self._cache_path(Path(input_path).resolve())
+        return cache_path if cache_path.exists() else None
+    
+    def _cache_path(self, input_path: Path) -> Path:
+        """Return where the cached Markdown for an input file lives."""
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{self._cache_key(input_path)}.md"
+    
+    def _cache_key(self, input_path: Path) -> str:
+        """Build a cache key from the input file contents and OCR settings."""
+        digest = _hash_file(input_path)
+        
+        mode = 'force' if self.force_ocr else 'skip'
+        if self.force_ocr_always:
+            mode += '_always'
+        if self.clean:
+            mode += '_clean'
+        return f"v{CACHE_FORMAT_VERSION}-{digest}-{self.backend}-{mode}-{self.language}"
+    
+    def _write_cache(self, cache_path: Path, output_path: Path) -> None:
+        """Atomically store a Markdown result in the cache."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+            os.close(fd)
+            try:
+                shutil.copyfile(output_path, tmp_path)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # Caching is best-effort; a failed write must not fail the conversion
+            pass
+    
     def _convert_to_pdf(self, input_path: Path, tmpdir: str) -> str:
         """Convert input file to PDF format."""
         ext = input_path.suffix.lower()
@@ -81,116 +487,250 @@ class DocumentProcessor:
         if ext == '.pdf':
             return str(input_path)
         
+        converter = _PDF_CONVERTERS.get(ext)
+        if converter is None:
+            raise ValueError(f"Unsupported file format: {ext}")
+        
+        return converter(self, input_path, tmpdir)
+    
+    def _image_to_pdf(self, input_path: Path, tmpdir: str) -> str:
+        """Convert image to PDF using MuPDF, falling back to img2pdf."""
         pdf_path = os.path.join(tmpdir, "input.pdf")
         
-        if ext in ['.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp']:
-            # Convert image to PDF using img2pdf
+        try:
+            with pymupdf.open(str(input_path)) as img_doc:
+                pdf_bytes = img_doc.convert_to_pdf()
+            Path(pdf_path).write_bytes(pdf_bytes)
+        except Exception:
+            # Formats MuPDF cannot read are still handled by img2pdf
             with open(pdf_path, "wb") as f:
                 f.write(img2pdf.convert(str(input_path)))
-                
-        elif ext in ['.txt', '.csv', '.docx', '.doc', '.odt', '.rtf']:
-            # Convert document to PDF using LibreOffice
-            result = subprocess.run([
-                'libreoffice', '--headless', '--convert-to', 'pdf',
-                '--outdir', tmpdir, str(input_path)
-            ], check=True, capture_output=True, text=True)
-            
-            # LibreOffice creates PDF with same name as input
-            converted_name = input_path.stem + '.pdf'
-            converted_path = os.path.join(tmpdir, converted_name)
-            
-            if not os.path.exists(converted_path):
-                raise FileNotFoundError(f"LibreOffice conversion failed: {converted_path}")
-            
-            pdf_path = converted_path
-            
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
         
         return pdf_path
     
+    def _document_to_pdf(self, input_path: Path, tmpdir: str) -> str:
+        """Convert document to PDF using LibreOffice."""
+        converted = convert_documents_to_pdf([input_path], tmpdir)
+        
+        if input_path not in converted:
+            raise FileNotFoundError(f"LibreOffice conversion failed: {input_path}")
+        
+        return converted[input_path]
+    
+    def _is_born_digital(self, pdf_path: str) -> bool:
+        """Check whether a PDF already contains selectable text on its first pages."""
+        total = 0
+        with pymupdf.open(pdf_path) as doc:
+            for page_number in range(min(BORN_DIGITAL_SAMPLE_PAGES, doc.page_count)):
+                total += len(doc[page_number].get_text("text"))
+                if total > BORN_DIGITAL_MIN_CHARS:
+                    return True
+        
+        return False
+    
     def _apply_ocr(self, pdf_path: str, tmpdir: str) -> str:
-        """Apply OCR to PDF using OCRmyPDF."""
+        """Apply OCR to PDF using OCRmyPDF, sharding large documents by page range."""
+        if self.backend == 'tesserocr':
+            return self._apply_ocr_tesserocr(pdf_path, tmpdir)
+        
         ocr_output = os.path.join(tmpdir, "ocr_output.pdf")
         
-        # OCRmyPDF command with optimized parameters from reference
-        cmd = [
-            'ocrmypdf',
-            '-l', self.language,
-            '--deskew',
-            '--clean',
-            '--tesseract-timeout', '300',
-            '--jobs', '2'
-        ]
+        with pymupdf.open(pdf_path) as doc:
+            page_ranges = _page_ranges(doc.page_count, self.cpu_budget)
+            chunks = len(page_ranges)
+            deskew = self._needs_deskew(doc)
+            
+            if chunks == 1:
+                _run_ocrmypdf(pdf_path, ocr_output, self._ocr_options(jobs=min(2, self.cpu_budget), deskew=deskew))
+                return ocr_output
+            
+            # Write each page range out as its own chunk
+            chunk_inputs = []
+            chunk_outputs = []
+            for i, (start, end) in enumerate(page_ranges):
+                chunk_in = os.path.join(tmpdir, f"chunk_{i}.pdf")
+                with pymupdf.open() as chunk_doc:
+                    chunk_doc.insert_pdf(doc, from_page=start, to_page=end)
+                    chunk_doc.save(chunk_in)
+                chunk_inputs.append(chunk_in)
+                chunk_outputs.append(os.path.join(tmpdir, f"chunk_{i}_ocr.pdf"))
         
-        # Add force OCR or skip text based on setting
-        if self.force_ocr:
-            cmd.append('--force-ocr')
-        else:
-            cmd.append('--skip-text')
+        # One Tesseract job per chunk to avoid oversubscribing the CPU
+        with ProcessPoolExecutor(max_workers=chunks) as executor:
+            options = self._ocr_options(jobs=1, deskew=deskew)
+            list(executor.map(
+                _run_ocrmypdf, chunk_inputs, chunk_outputs, [options] * chunks
+            ))
         
-        cmd.extend([pdf_path, ocr_output])
+        # Reassemble OCR'd chunks in page order
+        with pymupdf.open() as merged:
+            for chunk_out in chunk_outputs:
+                with pymupdf.open(chunk_out) as chunk_doc:
+                    merged.insert_pdf(chunk_doc)
+            merged.save(ocr_output)
         
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return ocr_output
+    
+    def _apply_ocr_tesserocr(self, pdf_path: str, tmpdir: str) -> str:
+        """Apply OCR to PDF using an in-process Tesseract API, page by page."""
+        ocr_output = os.path.join(tmpdir, "ocr_output.pdf")
+        api = _get_tesserocr_api(self.language)
+        level = tesserocr.RIL.TEXTLINE
+        scale = 72 / TESSEROCR_DPI
+        
+        with pymupdf.open(pdf_path) as doc, pymupdf.open() as out:
+            for page in doc:
+                # Keep pages that already have text unless OCR is forced
+                if not self.force_ocr and page.get_text("text").strip():
+                    out.insert_pdf(doc, from_page=page.number, to_page=page.number)
+                    continue
+                
+                pix = page.get_pixmap(dpi=TESSEROCR_DPI, alpha=False)
+                img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                api.SetImage(img)
+                api.SetSourceResolution(TESSEROCR_DPI)
+                api.Recognize()
+                
+                # Write each recognized line at its position on a blank page
+                out_page = out.new_page(width=page.rect.width, height=page.rect.height)
+                for line in tesserocr.iterate_level(api.GetIterator(), level):
+                    text = line.GetUTF8Text(level)
+                    bbox = line.BoundingBox(level)
+                    if not text or not text.strip() or bbox is None:
+                        continue
+                    x0, y0, x1, y1 = bbox
+                    out_page.insert_text(
+                        (x0 * scale, y1 * scale),
+                        text.strip(),
+                        fontsize=max(1.0, (y1 - y0) * scale * 0.8)
+                    )
+            
+            out.save(ocr_output)
         
         return ocr_output
     
-    def _convert_to_markdown(self, pdf_path: str) -> str:
-        """Convert OCR'd PDF to Markdown format."""
+    def _ocr_to_markdown_paddle(self, pdf_path: str, out_fh: TextIO) -> None:
+        """OCR PDF pages on the GPU with PaddleOCR, writing recognized text to out_fh."""
+        engine = _get_paddle_ocr(self.language)
+        
+        def page_texts():
+            with pymupdf.open(pdf_path) as doc:
+                for page in doc:
+                    pix = page.get_pixmap(dpi=PADDLE_DPI, alpha=False)
+                    arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+                        pix.height, pix.width, pix.n
+                    )
+                    # PaddleOCR expects BGR channel order for arrays
+                    result = engine.ocr(arr[:, :, ::-1], cls=True)
+                    lines = (result[0] if result else None) or []
+                    yield '\n'.join(text for _box, (text, _score) in lines)
+        
+        _write_sanitized_pages(page_texts(), out_fh)
+    
+    def _needs_deskew(self, doc: pymupdf.Document) -> bool:
+        """Check whether any sampled page is skewed by more than SKEW_THRESHOLD_DEGREES."""
+        for page_number in range(min(SKEW_SAMPLE_PAGES, doc.page_count)):
+            pix = doc[page_number].get_pixmap(dpi=SKEW_DPI, colorspace=pymupdf.csGRAY, alpha=False)
+            if abs(_estimate_skew(pix)) > SKEW_THRESHOLD_DEGREES:
+                return True
+        
+        return False
+    
+    def _ocr_options(self, jobs: int, deskew: bool = True) -> Dict[str, Any]:
+        """Build the OCRmyPDF API options for a single input."""
+        # OCRmyPDF options with optimized parameters from reference
+        options: Dict[str, Any] = {
+            'language': self.language,
+            'deskew': deskew,
+            'clean': self.clean,
+            'optimize': self.optimize,
+            'tesseract_timeout': 300,
+            'jobs': jobs,
+            'progress_bar': False,
+        }
+        
+        # Add force OCR or skip text based on setting
+        if self.force_ocr:
+            options['force_ocr'] = True
+        else:
+            options['skip_text'] = True
+        
+        return options
+    
+    def _convert_to_markdown(self, pdf_path: str, out_fh: TextIO) -> bool:
+        """
+        Convert OCR'd PDF to Markdown format, writing it page by page to out_fh.
+        
+        Returns:
+            True if the primary conversion succeeded, False if fallback output was written
+        """
         try:
             # Primary method: PyMuPDF4LLM for LLM-optimized markdown
-            md_text = pymupdf4llm.to_markdown(pdf_path, write_images=False)
-            
-            # Sanitize for LLM compatibility (from reference code)
-            md_text = re.sub(r'[^\x00-\x7F]+', '', md_text)  # Remove non-ASCII
-            md_text = re.sub(r'\s+', ' ', md_text).strip()   # Normalize whitespace
+            page_chunks = pymupdf4llm.to_markdown(pdf_path, write_images=False, page_chunks=True)
             
-            return md_text
+            # Sanitize each page for LLM compatibility (from reference code)
+            _write_sanitized_pages((chunk['text'] for chunk in page_chunks), out_fh)
+            return True
             
         except Exception as md_error:
-            # Fallback: block-based text extraction
-            return self._fallback_text_extraction(pdf_path, md_error)
+            # Fallback: block-based text extraction, replacing any partial output
+            out_fh.seek(0)
+            out_fh.truncate()
+            out_fh.write(self._fallback_text_extraction(pdf_path, md_error))
+            return False
     
     def _fallback_text_extraction(self, pdf_path: str, original_error: Exception) -> str:
         """Fallback text extraction method."""
         try:
-            doc = pymupdf.open(pdf_path)
-            fallback_text = f"# Document Conversion\n\n*Note: Primary markdown conversion failed ({str(original_error)}), using fallback extraction.*\n\n"
+            parts = [f"# Document Conversion\n\n*Note: Primary markdown conversion failed ({str(original_error)}), using fallback extraction.*\n\n"]
             
-            for page in doc:
-                try:
-                    blocks = page.get_text("blocks", flags=pymupdf.TEXTFLAGS_TEXT)
-                    fallback_text += f"\n## Page {page.number + 1}\n\n"
-                    
-                    for block in blocks:
-                        text = block[4].strip()  # Block text content
-                        if text:
-                            fallback_text += f"{text}\n\n"
-                            
-                except Exception as page_error:
-                    fallback_text += f"*[Page {page.number + 1}: Error extracting text: {str(page_error)}]*\n\n"
-            
-            doc.close()
+            with pymupdf.open(pdf_path) as doc:
+                page_ranges = _page_ranges(doc.page_count, self.cpu_budget)
             
-            # Apply same sanitization
-            fallback_text = re.sub(r'[^\x00-\x7F]+', '', fallback_text)
-            fallback_text = re.sub(r'\s+', ' ', fallback_text).strip()
+            if len(page_ranges) == 1:
+                first_page, last_page = page_ranges[0]
+                parts.extend(_extract_text_blocks(pdf_path, first_page, last_page))
+            else:
+                # PyMuPDF is not thread-safe, so page ranges are extracted in separate processes
+                with ProcessPoolExecutor(max_workers=len(page_ranges)) as executor:
+                    for range_parts in executor.map(
+                        _extract_text_blocks,
+                        [pdf_path] * len(page_ranges),
+                        [first for first, _ in page_ranges],
+                        [last for _, last in page_ranges]
+                    ):
+                        parts.extend(range_parts)
             
-            return fallback_text
+            fallback_text = ''.join(parts)
+            
+            # Apply same sanitization
+            return _sanitize_text(fallback_text)
             
         except Exception as fallback_error:
             return f"# Conversion Failed\n\nBoth primary and fallback text extraction failed.\n\nPrimary error: {str(original_error)}\nFallback error: {str(fallback_error)}"
 
 
+# DocumentProcessor method that converts each non-PDF extension to PDF
+_PDF_CONVERTERS: Dict[str, Callable[[DocumentProcessor, Path, str], str]] = {
+    **dict.fromkeys(_IMAGE_EXTENSIONS, DocumentProcessor._image_to_pdf),
+    **dict.fromkeys(_DOCUMENT_EXTENSIONS, DocumentProcessor._document_to_pdf),
+}
+
+
 def get_supported_extensions():
     """Return list of supported file extensions."""
-    return [
-        '.pdf',
-        '.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp',
-        '.txt', '.csv', '.docx', '.doc', '.odt', '.rtf'
-    ]
+    return sorted(_SUPPORTED_EXTENSIONS)
+
+
+def is_document_file(file_path: str) -> bool:
+    """Check if file is an office document that is converted with LibreOffice."""
+    return Path(file_path).suffix.lower() in _DOCUMENT_EXTENSIONS
 
 
 def is_supported_file(file_path: str) -> bool:
     """Check if file extension is supported."""
-    return Path(file_path).suffix.lower() in get_supported_extensions()
\ No newline at end of file
+    # Plain string slicing instead of Path(...).suffix; mirrors suffix semantics
+    # for dotfiles ('.pdf' alone has no suffix) and directory components
+    name = file_path[max(file_path.rfind('/'), file_path.rfind(os.sep)) + 1:]
+    i = name.rfind('.')
+    return i > 0 and name[i:].lower() in _SUPPORTED_EXTENSIONS
\ No newline at end of file
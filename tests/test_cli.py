@@ -0,0 +1,55 @@
+"""
+Tests for docr.cli file discovery.
+"""
+
+import os
+
+import pytest
+
+from docr.cli import _walk_supported_files, find_input_files
+from docr.processor import is_supported_file
+
+
+@pytest.fixture
+def input_tree(tmp_path):
+    for name in [
+        "a.pdf", "b.PNG", "c.txt", "skip.zip", ".pdf",
+        "sub/d.docx", "sub/e.md", "sub/deeper/f.jpeg", "other.pdf/g.tif",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    return tmp_path
+
+
+@pytest.mark.parametrize("recursive", [False, True])
+def test_walk_matches_glob(input_tree, recursive):
+    # Behaviour of the original Path.glob based implementation
+    pattern = "**/*" if recursive else "*"
+    expected = sorted(
+        p for p in input_tree.glob(pattern) if p.is_file() and is_supported_file(str(p))
+    )
+    
+    assert sorted(_walk_supported_files(input_tree, recursive)) == expected
+    assert find_input_files(input_tree, recursive) == expected
+
+
+def test_walk_skips_unreadable_directory(input_tree, monkeypatch, capsys):
+    real_scandir = os.scandir
+    
+    def scandir(path):
+        if str(path).endswith("sub"):
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+    
+    monkeypatch.setattr(os, "scandir", scandir)
+    
+    found = find_input_files(input_tree, recursive=True)
+    
+    assert all("sub" not in p.parts for p in found)
+    assert "Skipping unreadable directory" in capsys.readouterr().err
+
+
+def test_missing_input_path_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        find_input_files(tmp_path / "missing")
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Tests for docr.processor helpers that do not need OCR binaries.
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from docr.processor import (
+    CACHE_FORMAT_VERSION,
+    MIN_PAGES_PER_CHUNK,
+    DocumentProcessor,
+    _hash_file,
+    _page_ranges,
+    _sanitize_text,
+    _write_sanitized_pages,
+    get_supported_extensions,
+    is_supported_file,
+)
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    path = tmp_path / "sample.pdf"
+    path.write_bytes(b"%PDF-1.4 sample content")
+    return path
+
+
+def test_cache_key_layout(sample_file, tmp_path):
+    proc = DocumentProcessor(cache_dir=tmp_path / "cache")
+    key = proc._cache_key(sample_file)
+    
+    assert key == f"v{CACHE_FORMAT_VERSION}-{_hash_file(sample_file)}-ocrmypdf-force-eng"
+
+
+def test_cache_key_depends_on_content_not_path(sample_file, tmp_path):
+    copy = tmp_path / "other" / "copy.pdf"
+    copy.parent.mkdir()
+    copy.write_bytes(sample_file.read_bytes())
+    proc = DocumentProcessor(cache_dir=tmp_path / "cache")
+    
+    assert proc._cache_key(copy) == proc._cache_key(sample_file)
+    
+    copy.write_bytes(b"different")
+    assert proc._cache_key(copy) != proc._cache_key(sample_file)
+
+
+@pytest.mark.parametrize("options", [
+    {'force_ocr': False},
+    {'force_ocr_always': True},
+    {'clean': True},
+    {'language': 'fra'},
+    {'backend': 'tesserocr'},
+])
+def test_cache_key_depends_on_settings(sample_file, tmp_path, options):
+    default = DocumentProcessor(cache_dir=tmp_path)
+    changed = DocumentProcessor(cache_dir=tmp_path, **options)
+    
+    assert changed._cache_key(sample_file) != default._cache_key(sample_file)
+
+
+def _stub_pipeline(monkeypatch, primary_succeeds):
+    """Skip OCR and make Markdown conversion write fixed text."""
+    def convert(self, pdf_path, out_fh):
+        out_fh.write("converted text")
+        return primary_succeeds
+    
+    monkeypatch.setattr(DocumentProcessor, '_is_born_digital', lambda self, pdf_path: True)
+    monkeypatch.setattr(DocumentProcessor, '_convert_to_markdown', convert)
+
+
+def test_successful_conversion_is_cached_and_reused(sample_file, tmp_path, monkeypatch):
+    _stub_pipeline(monkeypatch, primary_succeeds=True)
+    proc = DocumentProcessor(cache_dir=tmp_path / "cache")
+    output = tmp_path / "out" / "sample.md"
+    
+    success, error, _ = proc.process_file(str(sample_file), str(output), str(sample_file))
+    assert success, error
+    cached = proc.cached_result_path(str(sample_file))
+    assert cached is not None
+    assert cached.read_text() == "converted text"
+    
+    # A cache hit must not run the pipeline again
+    monkeypatch.setattr(DocumentProcessor, '_convert_to_markdown', None)
+    second = tmp_path / "out" / "second.md"
+    success, error, _ = proc.process_file(str(sample_file), str(second), str(sample_file))
+    assert success, error
+    assert second.read_text() == "converted text"
+
+
+def test_fallback_output_is_not_cached(sample_file, tmp_path, monkeypatch):
+    _stub_pipeline(monkeypatch, primary_succeeds=False)
+    proc = DocumentProcessor(cache_dir=tmp_path / "cache")
+    output = tmp_path / "sample.md"
+    
+    success, error, _ = proc.process_file(str(sample_file), str(output), str(sample_file))
+    
+    assert success, error
+    assert output.read_text() == "converted text"
+    assert proc.cached_result_path(str(sample_file)) is None
+
+
+def test_failed_conversion_leaves_no_output(sample_file, tmp_path, monkeypatch):
+    def convert(self, pdf_path, out_fh):
+        out_fh.write("partial")
+        raise RuntimeError("boom")
+    
+    monkeypatch.setattr(DocumentProcessor, '_is_born_digital', lambda self, pdf_path: True)
+    monkeypatch.setattr(DocumentProcessor, '_convert_to_markdown', convert)
+    proc = DocumentProcessor(cache_dir=None)
+    
+    success, error, _ = proc.process_file(str(sample_file), str(tmp_path / "sample.md"), str(sample_file))
+    
+    assert not success
+    assert error == "boom"
+    assert list(tmp_path.iterdir()) == [sample_file]
+
+
+@pytest.mark.parametrize("page_count", [0, 1, 3, 4, 9, 13, 100, 501])
+@pytest.mark.parametrize("max_chunks", [1, 2, 8])
+def test_page_ranges_cover_all_pages_in_order(page_count, max_chunks):
+    ranges = _page_ranges(page_count, max_chunks)
+    
+    assert 1 <= len(ranges) <= max_chunks
+    pages = [page for first, last in ranges for page in range(first, last + 1)]
+    assert pages == list(range(page_count))
+    if len(ranges) > 1:
+        assert all(last - first + 1 >= MIN_PAGES_PER_CHUNK for first, last in ranges)
+
+
+def test_page_ranges_single_chunk_without_budget():
+    assert _page_ranges(100, 1) == [(0, 99)]
+
+
+@pytest.mark.parametrize("file_path", [
+    "a.pdf", "A.PDF", "dir.pdf/file", "/x.y/b", "/x.y/b.PNG", ".pdf", "dir/.pdf",
+    "a.tar.pdf", "noext", "a.", "a..pdf", "x.pdf.", "..pdf", "report.docx", "notes.md",
+])
+def test_is_supported_file_matches_path_suffix(file_path):
+    expected = Path(file_path).suffix.lower() in get_supported_extensions()
+    assert is_supported_file(file_path) == expected
+
+
+def test_streamed_sanitization_matches_whole_document():
+    pages = ["# Title\n\nCafé  text\t", "   ", "☃", "next\npage\n\n", "last"]
+    out = io.StringIO()
+    
+    _write_sanitized_pages(pages, out)
+    
+    assert out.getvalue() == _sanitize_text(''.join(pages))
\ No newline at end of file